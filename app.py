@@ -4,18 +4,39 @@ Interactive dashboard with real-time visualization and analytics
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import time
-import json
-from datetime import datetime
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 # ==================== CONFIGURATION ====================
 
 API_BASE_URL = "http://localhost:8000"
+API_TIMEOUT = (0.5, 2.0)  # (connect, read) seconds - a dead backend must not freeze the UI
+MAX_PLOT_POINTS = 2000  # Charts are ~1000px wide; more points are pure overhead
+QUEUE_COLUMNS = ['queue_north', 'queue_south', 'queue_east', 'queue_west']
+TIMESERIES_COLUMNS = ['timestamp', 'avg_wait_time'] + QUEUE_COLUMNS
+DIRS = ['North', 'South', 'East', 'West']
+LIGHT_COLOR = {'green': 'green', 'yellow': 'yellow', 'red': 'red'}
+TRAFFIC_LIGHT_SVG = (
+    '<div style="text-align: center;">'
+    '<svg width="300" height="120">'
+    '<circle cx="60" cy="60" r="40" fill="{ns}" stroke="black" stroke-width="2"/>'
+    '<text x="60" y="67" text-anchor="middle" font-size="20">N-S</text>'
+    '<circle cx="240" cy="60" r="40" fill="{ew}" stroke="black" stroke-width="2"/>'
+    '<text x="240" y="67" text-anchor="middle" font-size="20">E-W</text>'
+    '</svg></div>'
+)
+VEHICLE_TYPE_ROWS = (
+    ('car', "🚗 Car", "🔵"),
+    ('bus', "🚌 Bus", "🟡"),
+    ('truck', "🚚 Truck", "⚪"),
+    ('emergency', "🚑 Emergency", "🔴")
+)
 st.set_page_config(
     page_title="Smart Traffic Controller",
     page_icon="🚦",
@@ -24,7 +45,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -61,23 +82,28 @@ st.markdown("""
         color: white;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # ==================== API HELPERS ====================
 
+# Shared keep-alive session so reruns reuse pooled connections to the backend
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=1, backoff_factor=0.1, status_forcelist=(502, 503, 504))
+))
+
 def api_call(endpoint, method="GET", data=None):
     """Make API call with error handling"""
     try:
         url = f"{API_BASE_URL}{endpoint}"
-        if method == "GET":
-            response = requests.get(url)
-        elif method == "POST":
-            response = requests.post(url, json=data)
-        elif method == "PUT":
-            response = requests.put(url, json=data)
+        response = SESSION.request(method, url, json=data, timeout=API_TIMEOUT)
         
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             st.error(f"API Error: {response.status_code}")
             return None
@@ -85,32 +111,327 @@ def api_call(endpoint, method="GET", data=None):
         st.error(f"Connection Error: {e}")
         return None
 
+@st.cache_data(ttl=0.5, show_spinner=False)
 def get_simulation_state():
     """Get current simulation state"""
     return api_call("/simulation/state")
 
+@st.cache_data(ttl=1, show_spinner=False)
 def get_analytics_summary():
     """Get analytics summary"""
     return api_call("/analytics/summary")
 
-def get_timeseries():
-    """Get time series data"""
-    return api_call("/analytics/timeseries")
+@st.cache_data(ttl=1, show_spinner=False)
+def get_timeseries(since=0.0):
+    """Get time series data recorded after `since`"""
+    return api_call(f"/analytics/timeseries?since={since}")
 
+def get_new_timeseries():
+    """Get time series rows newer than the ones already accumulated in this session"""
+    return get_timeseries(st.session_state.last_ts)
+
+@st.cache_data(ttl=1, show_spinner=False)
 def get_agent_decisions():
     """Get agent decision history"""
     return api_call("/analytics/agent_decisions")
 
+@st.cache_data(ttl=1, show_spinner=False)
 def get_vehicle_stats():
     """Get vehicle statistics"""
     return api_call("/analytics/vehicle_stats")
 
+DASHBOARD_FETCHERS = {
+    'state': get_simulation_state,
+    'vehicle_stats': get_vehicle_stats,
+    'summary': get_analytics_summary,
+    'timeseries': get_new_timeseries,
+    'decisions': get_agent_decisions
+}
+
+def fetch_all(keys=tuple(DASHBOARD_FETCHERS)):
+    """Fetch the requested dashboard data concurrently (one round-trip window per rerun)"""
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=len(keys),
+                            initializer=add_script_run_ctx, initargs=(None, ctx)) as ex:
+        futures = {key: ex.submit(DASHBOARD_FETCHERS[key]) for key in keys}
+        return {key: future.result() for key, future in futures.items()}
+
+# ==================== DATA HELPERS ====================
+
+def columns(rows, keys=TIMESERIES_COLUMNS):
+    """Extract numeric columns from a list of records without building a DataFrame"""
+    # Timestamps stay float64: they are sent back to the API as the `since` cursor
+    return {
+        key: np.fromiter((r[key] for r in rows),
+                         dtype=np.float64 if key == 'timestamp' else np.float32, count=len(rows))
+        for key in keys
+    }
+
+def reset_timeseries():
+    """Drop the accumulated time series"""
+    st.session_state.ts_cols = columns([])
+    st.session_state.last_ts = 0.0
+    st.session_state.ts_run_id = None
+
+def merge_timeseries(rows, summary):
+    """Append newly fetched time series rows to the session columns"""
+    run_id = summary.get('run_id') if summary and 'error' not in summary else None
+    if run_id is not None and run_id != st.session_state.ts_run_id:
+        if st.session_state.ts_run_id is not None:
+            # The backend was reset elsewhere: drop the old run and refetch the new one from its start
+            reset_timeseries()
+            get_timeseries.clear()
+            rows = get_timeseries(0.0)
+        st.session_state.ts_run_id = run_id
+    
+    if rows and isinstance(rows, list):
+        new = columns(rows)
+        st.session_state.ts_cols = {
+            key: np.concatenate((st.session_state.ts_cols[key], new[key])) for key in TIMESERIES_COLUMNS
+        }
+        st.session_state.last_ts = float(new['timestamp'][-1])
+    
+    return st.session_state.ts_cols
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling, returns indices of points to keep"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; inner points split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick and next bucket average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    
+    return indices
+
+def downsample(x, y, n_out=MAX_PLOT_POINTS):
+    """Downsample a series with LTTB for plotting"""
+    idx = lttb_indices(x, y, n_out)
+    return x[idx], y[idx]
+
+# ==================== STATIC CONTENT ====================
+
+@st.cache_resource
+def get_agent_rules_df():
+    """Agent rules table, built once per process"""
+    return pd.DataFrame([
+        {
+            "Priority": 1,
+            "Rule": "Emergency Vehicle Detection",
+            "Condition": "Emergency vehicle waiting",
+            "Action": "Immediate green light for emergency direction",
+            "Impact": "🚑 Life-saving priority"
+        },
+        {
+            "Priority": 2,
+            "Rule": "High Queue Extension",
+            "Condition": "Queue length > 10 vehicles",
+            "Action": "Extend green time by +10 seconds",
+            "Impact": "📊 Reduces congestion"
+        },
+        {
+            "Priority": 3,
+            "Rule": "Long Wait Extension",
+            "Condition": "Average wait > 60 seconds",
+            "Action": "Extend green time by +5 seconds",
+            "Impact": "⏱️ Improves wait times"
+        },
+        {
+            "Priority": 4,
+            "Rule": "Standard Timing",
+            "Condition": "Normal conditions",
+            "Action": "Maintain regular light cycles",
+            "Impact": "⚖️ Balanced flow"
+        }
+    ])
+
+DOCUMENTATION_MD = """
+## 🚦 Smart Traffic Light Controller
+
+### Overview
+
+An AI-powered traffic management system that uses intelligent agents and data science 
+to optimize traffic flow at intersections.
+
+---
+
+### 🤖 Agentic AI Components
+
+#### 1. Perception-Decision-Action Loop
+- **Perceive**: Monitor environment (queues, wait times, vehicle types)
+- **Decide**: Apply rule-based logic with priority handling
+- **Act**: Adjust traffic light timing dynamically
+
+#### 2. Rule-Based Intelligence
+- Emergency vehicle priority (highest)
+- Queue-based adaptive timing
+- Wait time optimization
+- Standard cycle management
+
+#### 3. Learning & Adaptation
+- Tracks decision effectiveness
+- Logs metrics for offline analysis
+- Pattern recognition for optimization
+
+---
+
+### 🔍 Search Algorithms
+
+#### A* Pathfinding Implementation
+
+**Algorithm**: A* (A-star) search for optimal vehicle routing
+
+**Components**:
+- **Heuristic**: Manhattan distance
+- **Cost Function**: g(n) + h(n)
+- **Open List**: Priority queue of nodes to explore
+- **Closed List**: Visited nodes
+
+**Applications**:
+- Vehicle path planning
+- Intersection navigation
+- Collision avoidance
+
+**Complexity**: O(b^d) where b=branching factor, d=depth
+
+---
+
+### 🚗 Vehicle Types & Color Coding
+
+| Vehicle | Color | Speed | Priority | Characteristics |
+|---------|-------|-------|----------|-----------------|
+| 🚗 Car | 🔵 Blue | 2.0 | 1 | Standard vehicle |
+| 🚌 Bus | 🟡 Yellow | 1.2 | 2 | Higher priority, larger |
+| 🚚 Truck | ⚪ Gray | 1.0 | 1 | Slow, large cargo |
+| 🚑 Emergency | 🔴 Red (Flash) | 3.5 | 10 | Highest priority |
+
+---
+
+### 📊 Data Science Concepts
+
+#### 1. Real-Time Data Collection
+- CSV logging with timestamps
+- Queue length tracking
+- Wait time measurements
+- Vehicle type distribution
+
+#### 2. Statistical Metrics
+- **Mean**: Average wait times
+- **Max**: Peak queue lengths
+- **Distribution**: Vehicle type frequencies
+- **Throughput**: Vehicles per minute
+
+#### 3. Time Series Analysis
+- Trend detection
+- Pattern recognition
+- Seasonal variations
+- Anomaly detection
+
+#### 4. Visualization Techniques
+- Line charts for trends
+- Heatmaps for distribution
+- Pie charts for proportions
+- Bar charts for comparisons
+
+---
+
+### 🏗️ System Architecture
+
+```
+┌─────────────────┐
+│   Streamlit     │  Frontend Dashboard
+│   Frontend      │  - Live visualization
+└────────┬────────┘  - Control interface
+         │
+         │ HTTP/WebSocket
+         ↓
+┌─────────────────┐
+│   FastAPI       │  Backend API
+│   Backend       │  - Simulation engine
+└────────┬────────┘  - Analytics
+         │
+         │
+┌────────┴────────┐
+│  Simulation     │  Core Logic
+│  Engine         │  - Agent AI
+│                 │  - A* pathfinding
+│                 │  - Data collection
+└─────────────────┘
+```
+
+---
+
+### 🔧 API Endpoints
+
+#### Simulation Control
+- `POST /simulation/start` - Start simulation
+- `POST /simulation/pause` - Pause simulation
+- `POST /simulation/resume` - Resume simulation
+- `POST /simulation/stop` - Stop simulation
+- `POST /simulation/reset` - Reset simulation
+- `GET /simulation/state` - Get current state
+
+#### Analytics
+- `GET /analytics/summary` - Get summary statistics
+- `GET /analytics/timeseries` - Get time series data
+- `GET /analytics/agent_decisions` - Get decision history
+- `GET /analytics/vehicle_stats` - Get vehicle statistics
+
+#### Configuration
+- `GET /simulation/config` - Get configuration
+- `PUT /simulation/config` - Update configuration
+- `POST /simulation/spawn_emergency` - Spawn emergency vehicle
+
+---
+
+### 📈 Key Performance Indicators
+
+1. **Average Wait Time**: Lower is better
+2. **Throughput**: Vehicles per minute
+3. **Queue Length**: Peak and average
+4. **Emergency Response Time**: Critical metric
+5. **Agent Decision Efficiency**: Rule utilization
+
+---
+
+### 🎯 Project Highlights
+
+✅ **Intelligent Agents**: Rule-based decision making with priority handling
+
+✅ **A* Algorithm**: Optimal pathfinding for vehicle navigation
+
+✅ **Real-Time Data**: Live collection and streaming
+
+✅ **Statistical Analysis**: Comprehensive metrics and KPIs
+
+✅ **Visualization**: Interactive dashboards with Plotly
+
+✅ **Scalable Architecture**: FastAPI backend + Streamlit frontend
+
+"""
+
 # ==================== INITIALIZATION ====================
 
 if 'simulation_running' not in st.session_state:
     st.session_state.simulation_running = False
 if 'auto_refresh' not in st.session_state:
     st.session_state.auto_refresh = False  # Changed to False - user can enable manually
+if 'ts_cols' not in st.session_state:
+    reset_timeseries()
 
 # ==================== HEADER ====================
 
@@ -159,6 +480,9 @@ with st.sidebar:
     if st.button("🔄 Reset", use_container_width=True):
         result = api_call("/simulation/reset", "POST")
         if result:
+            # Drop cached responses so stale analytics don't survive a reset
+            st.cache_data.clear()
+            reset_timeseries()
             st.session_state.simulation_running = False
             st.success("Simulation reset!")
     
@@ -173,34 +497,36 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Configuration
+    # Configuration - sliders inside a form only trigger a rerun on submit
     st.subheader("⚙️ Configuration")
     
-    spawn_rate = st.slider("Vehicle Spawn Rate (s)", 0.5, 5.0, 2.0, 0.5)
-    max_vehicles = st.slider("Max Vehicles", 20, 150, 80, 10)
-    green_time = st.slider("Green Light Duration (s)", 15, 60, 30, 5)
-    
-    if st.button("Apply Config", use_container_width=True):
-        config = {
-            "spawn_rate": spawn_rate,
-            "max_vehicles": max_vehicles,
-            "green_time": green_time,
-            "queue_threshold": 10,
-            "wait_threshold": 60
-        }
-        result = api_call("/simulation/config", "PUT", config)
-        if result:
-            st.success("Configuration updated!")
+    with st.form("config_form", clear_on_submit=False):
+        spawn_rate = st.slider("Vehicle Spawn Rate (s)", 0.5, 5.0, 2.0, 0.5)
+        max_vehicles = st.slider("Max Vehicles", 20, 150, 80, 10)
+        green_time = st.slider("Green Light Duration (s)", 15, 60, 30, 5)
+        
+        if st.form_submit_button("Apply Config", use_container_width=True):
+            config = {
+                "spawn_rate": spawn_rate,
+                "max_vehicles": max_vehicles,
+                "green_time": green_time,
+                "queue_threshold": 10,
+                "wait_threshold": 60
+            }
+            result = api_call("/simulation/config", "PUT", config)
+            if result:
+                st.success("Configuration updated!")
     
     st.markdown("---")
     
     # Auto-refresh
     st.subheader("🔄 Auto Refresh")
-    st.warning("⚠️ Auto-refresh will reload the page continuously")
-    auto_refresh = st.checkbox("Enable Auto-Refresh (Not Recommended)", value=st.session_state.auto_refresh)
+    st.info("💡 Auto-refresh only re-runs the Live Dashboard tab")
+    auto_refresh = st.checkbox("Enable Auto-Refresh", value=st.session_state.auto_refresh)
     if auto_refresh != st.session_state.auto_refresh:
         st.session_state.auto_refresh = auto_refresh
     
+    refresh_interval = None
     if st.session_state.auto_refresh:
         refresh_interval = st.slider("Refresh Interval (s)", 1, 10, 2)
     
@@ -208,14 +534,19 @@ with st.sidebar:
 
 # ==================== MAIN CONTENT ====================
 
+# Fetch the analytics data in one concurrent batch; the live tab fetches its own
+dashboard_data = fetch_all(('summary', 'timeseries', 'decisions'))
+
 # Tab navigation
 tab1, tab2, tab3, tab4 = st.tabs(["📊 Live Dashboard", "📈 Analytics", "🤖 Agent Insights", "📚 Documentation"])
 
 # ==================== TAB 1: LIVE DASHBOARD ====================
 
-with tab1:
-    # Get current state
-    state = get_simulation_state()
+@st.fragment(run_every=refresh_interval)
+def live_dashboard():
+    """Live dashboard, re-run on its own when auto-refresh is enabled"""
+    live_data = fetch_all(('state', 'vehicle_stats'))
+    state = live_data['state']
     
     if state:
         # Status row
@@ -245,42 +576,9 @@ with tab1:
             # Traffic light visualization
             light = state['traffic_light']
             
-            fig = go.Figure()
-            
-            # North-South light
-            ns_color = 'green' if light['north_south'] == 'green' else 'yellow' if light['north_south'] == 'yellow' else 'red'
-            fig.add_trace(go.Scatter(
-                x=[0], y=[1],
-                mode='markers+text',
-                marker=dict(size=80, color=ns_color, line=dict(color='black', width=2)),
-                text=['N-S'],
-                textposition='middle center',
-                textfont=dict(size=20, color='black'),
-                name='North-South'
-            ))
-            
-            # East-West light
-            ew_color = 'green' if light['east_west'] == 'green' else 'yellow' if light['east_west'] == 'yellow' else 'red'
-            fig.add_trace(go.Scatter(
-                x=[1], y=[1],
-                mode='markers+text',
-                marker=dict(size=80, color=ew_color, line=dict(color='black', width=2)),
-                text=['E-W'],
-                textposition='middle center',
-                textfont=dict(size=20, color='black'),
-                name='East-West'
-            ))
-            
-            fig.update_layout(
-                showlegend=False,
-                height=250,
-                xaxis=dict(showgrid=False, zeroline=False, showticklabels=False, range=[-0.5, 1.5]),
-                yaxis=dict(showgrid=False, zeroline=False, showticklabels=False, range=[0.5, 1.5]),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            ns_color = LIGHT_COLOR.get(light['north_south'], 'red')
+            ew_color = LIGHT_COLOR.get(light['east_west'], 'red')
+            st.markdown(TRAFFIC_LIGHT_SVG.format(ns=ns_color, ew=ew_color), unsafe_allow_html=True)
             
             # Time remaining
             if light.get('emergency_mode'):
@@ -291,16 +589,15 @@ with tab1:
         with col2:
             st.subheader("🚗 Vehicle Types")
             
-            vehicle_stats = get_vehicle_stats()
+            vehicle_stats = live_data['vehicle_stats']
             if vehicle_stats and 'by_type' in vehicle_stats:
-                types_df = pd.DataFrame([
-                    {"Type": "🚗 Car", "Count": vehicle_stats['by_type']['car'], "Color": "🔵"},
-                    {"Type": "🚌 Bus", "Count": vehicle_stats['by_type']['bus'], "Color": "🟡"},
-                    {"Type": "🚚 Truck", "Count": vehicle_stats['by_type']['truck'], "Color": "⚪"},
-                    {"Type": "🚑 Emergency", "Count": vehicle_stats['by_type']['emergency'], "Color": "🔴"}
-                ])
+                types_table = {
+                    "Type": [label for _, label, _ in VEHICLE_TYPE_ROWS],
+                    "Count": [vehicle_stats['by_type'][key] for key, _, _ in VEHICLE_TYPE_ROWS],
+                    "Color": [color for _, _, color in VEHICLE_TYPE_ROWS]
+                }
                 
-                st.dataframe(types_df, hide_index=True, use_container_width=True)
+                st.dataframe(types_table, hide_index=True, use_container_width=True)
         
         st.markdown("---")
         
@@ -315,7 +612,6 @@ with tab1:
         for col, direction, icon in zip([col1, col2, col3, col4], directions, icons):
             with col:
                 queue_length = metrics.get(f'queue_{direction}', 0)
-                color = "🔴" if queue_length > 8 else "🟡" if queue_length > 5 else "🟢"
                 st.metric(
                     f"{icon} {direction.capitalize()}",
                     queue_length,
@@ -334,12 +630,18 @@ with tab1:
     else:
         st.warning("⚠️ No simulation data available. Start the simulation to see live data.")
 
+with tab1:
+    live_dashboard()
+
 # ==================== TAB 2: ANALYTICS ====================
 
-with tab2:
-    st.header("📈 Traffic Analytics & Statistics")
+def analytics_tab(summary, ts):
+    """Analytics tab body"""
+    # Plotly is imported lazily; only the chart tabs pay for it
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
     
-    summary = get_analytics_summary()
+    st.header("📈 Traffic Analytics & Statistics")
     
     if summary and 'error' not in summary:
         # Summary metrics
@@ -378,20 +680,22 @@ with tab2:
         st.markdown("---")
         
         # Time series data
-        timeseries = get_timeseries()
-        
-        if timeseries and isinstance(timeseries, list) and len(timeseries) > 0:
-            df = pd.DataFrame(timeseries)
-            
+        if len(ts['timestamp']) > 0:
             # Wait time over time
             st.subheader("⏱️ Average Wait Time Over Time")
-            fig = px.line(
-                df, x='timestamp', y='avg_wait_time',
+            timestamps = ts['timestamp']
+            wait_x, wait_y = downsample(timestamps, ts['avg_wait_time'])
+            fig = go.Figure(go.Scattergl(
+                x=wait_x, y=wait_y,
+                mode='lines',
+                line=dict(color='#FF6B35')
+            ))
+            fig.update_layout(
                 title="Average Wait Time Evolution",
-                labels={'timestamp': 'Time (s)', 'avg_wait_time': 'Wait Time (s)'}
+                xaxis_title="Time (s)",
+                yaxis_title="Wait Time (s)"
             )
-            fig.update_traces(line_color='#FF6B35')
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="wait_time_chart")
             
             # Queue lengths comparison
             st.subheader("📊 Queue Lengths Comparison")
@@ -399,31 +703,38 @@ with tab2:
             fig = make_subplots(rows=2, cols=2,
                               subplot_titles=('North', 'South', 'East', 'West'))
             
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['queue_north'],
-                                    name='North', line=dict(color='blue')),
+            queue_x, queue_y = downsample(timestamps, ts['queue_north'])
+            fig.add_trace(go.Scattergl(x=queue_x, y=queue_y,
+                                      name='North', line=dict(color='blue')),
                          row=1, col=1)
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['queue_south'],
-                                    name='South', line=dict(color='green')),
+            queue_x, queue_y = downsample(timestamps, ts['queue_south'])
+            fig.add_trace(go.Scattergl(x=queue_x, y=queue_y,
+                                      name='South', line=dict(color='green')),
                          row=1, col=2)
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['queue_east'],
-                                    name='East', line=dict(color='red')),
+            queue_x, queue_y = downsample(timestamps, ts['queue_east'])
+            fig.add_trace(go.Scattergl(x=queue_x, y=queue_y,
+                                      name='East', line=dict(color='red')),
                          row=2, col=1)
-            fig.add_trace(go.Scatter(x=df['timestamp'], y=df['queue_west'],
-                                    name='West', line=dict(color='orange')),
+            queue_x, queue_y = downsample(timestamps, ts['queue_west'])
+            fig.add_trace(go.Scattergl(x=queue_x, y=queue_y,
+                                      name='West', line=dict(color='orange')),
                          row=2, col=2)
             
             fig.update_layout(height=600, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="queue_lengths_chart")
             
             # Heatmap of queue distribution
             st.subheader("🔥 Queue Distribution Heatmap")
             
-            heatmap_data = df[['queue_north', 'queue_south', 'queue_east', 'queue_west']].T
+            # Decimate columns evenly so the heatmap stays within the plot budget
+            step = max(1, len(timestamps) // MAX_PLOT_POINTS)
+            queue_matrix = np.vstack([ts[col] for col in QUEUE_COLUMNS])
+            heatmap_z = np.ascontiguousarray(queue_matrix[:, ::step])
             
             fig = go.Figure(data=go.Heatmap(
-                z=heatmap_data.values,
-                x=df['timestamp'],
-                y=['North', 'South', 'East', 'West'],
+                z=heatmap_z,
+                x=timestamps[::step],
+                y=DIRS,
                 colorscale='RdYlGn_r',
                 colorbar=dict(title="Queue Length")
             ))
@@ -435,25 +746,17 @@ with tab2:
                 height=400
             )
             
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, key="queue_heatmap")
             
             # Statistics table
             st.subheader("📋 Detailed Statistics")
             
+            peaks = queue_matrix.max(axis=1).astype(int)
+            avgs = [summary['average_queue_length'][d] for d in ('north', 'south', 'east', 'west')]
             stats_df = pd.DataFrame({
-                'Direction': ['North', 'South', 'East', 'West'],
-                'Avg Queue': [
-                    summary['average_queue_length']['north'],
-                    summary['average_queue_length']['south'],
-                    summary['average_queue_length']['east'],
-                    summary['average_queue_length']['west']
-                ],
-                'Peak Queue': [
-                    df['queue_north'].max(),
-                    df['queue_south'].max(),
-                    df['queue_east'].max(),
-                    df['queue_west'].max()
-                ]
+                'Direction': DIRS,
+                'Avg Queue': avgs,
+                'Peak Queue': peaks
             })
             
             st.dataframe(stats_df, hide_index=True, use_container_width=True)
@@ -461,9 +764,16 @@ with tab2:
     else:
         st.warning("⚠️ No analytics data available. Run the simulation to collect data.")
 
+with tab2:
+    ts_cols = merge_timeseries(dashboard_data['timeseries'], dashboard_data['summary'])
+    analytics_tab(dashboard_data['summary'], ts_cols)
+
 # ==================== TAB 3: AGENT INSIGHTS ====================
 
-with tab3:
+def agent_insights_tab(decisions):
+    """Agent insights tab body"""
+    import plotly.express as px
+    
     st.header("🤖 Intelligent Agent Decision Analysis")
     
     st.markdown("""
@@ -479,44 +789,11 @@ with tab3:
     # Decision rules
     st.subheader("📜 Agent Rules (Priority Order)")
     
-    rules_df = pd.DataFrame([
-        {
-            "Priority": 1,
-            "Rule": "Emergency Vehicle Detection",
-            "Condition": "Emergency vehicle waiting",
-            "Action": "Immediate green light for emergency direction",
-            "Impact": "🚑 Life-saving priority"
-        },
-        {
-            "Priority": 2,
-            "Rule": "High Queue Extension",
-            "Condition": "Queue length > 10 vehicles",
-            "Action": "Extend green time by +10 seconds",
-            "Impact": "📊 Reduces congestion"
-        },
-        {
-            "Priority": 3,
-            "Rule": "Long Wait Extension",
-            "Condition": "Average wait > 60 seconds",
-            "Action": "Extend green time by +5 seconds",
-            "Impact": "⏱️ Improves wait times"
-        },
-        {
-            "Priority": 4,
-            "Rule": "Standard Timing",
-            "Condition": "Normal conditions",
-            "Action": "Maintain regular light cycles",
-            "Impact": "⚖️ Balanced flow"
-        }
-    ])
-    
-    st.dataframe(rules_df, hide_index=True, use_container_width=True)
+    st.dataframe(get_agent_rules_df(), hide_index=True, use_container_width=True)
     
     st.markdown("---")
     
     # Decision history
-    decisions = get_agent_decisions()
-    
     if decisions and 'decisions' in decisions:
         st.subheader("📊 Decision History")
         
@@ -537,192 +814,27 @@ with tab3:
                     color_discrete_sequence=px.colors.qualitative.Set3
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, key="decision_types_chart")
             
             # Recent decisions
             st.subheader("🕐 Recent Decisions")
             
-            recent = dec_df.tail(10).sort_values('timestamp', ascending=False)
-            st.dataframe(recent[['timestamp', 'type', 'action', 'reason']], hide_index=True, use_container_width=True)
+            # History is appended in time order, so newest-first is just a reversed tail
+            recent = dec_df.iloc[-10:][::-1][['timestamp', 'type', 'action', 'reason']]
+            st.dataframe(recent, hide_index=True, use_container_width=True)
     
     else:
         st.info("No decision history available yet.")
 
+with tab3:
+    agent_insights_tab(dashboard_data['decisions'])
+
 # ==================== TAB 4: DOCUMENTATION ====================
 
 with tab4:
     st.header("📚 System Documentation")
     
-    st.markdown("""
-    ## 🚦 Smart Traffic Light Controller
-    
-    ### Overview
-    
-    An AI-powered traffic management system that uses intelligent agents and data science 
-    to optimize traffic flow at intersections.
-    
-    ---
-    
-    ### 🤖 Agentic AI Components
-    
-    #### 1. Perception-Decision-Action Loop
-    - **Perceive**: Monitor environment (queues, wait times, vehicle types)
-    - **Decide**: Apply rule-based logic with priority handling
-    - **Act**: Adjust traffic light timing dynamically
-    
-    #### 2. Rule-Based Intelligence
-    - Emergency vehicle priority (highest)
-    - Queue-based adaptive timing
-    - Wait time optimization
-    - Standard cycle management
-    
-    #### 3. Learning & Adaptation
-    - Tracks decision effectiveness
-    - Logs metrics for offline analysis
-    - Pattern recognition for optimization
-    
-    ---
-    
-    ### 🔍 Search Algorithms
-    
-    #### A* Pathfinding Implementation
-    
-    **Algorithm**: A* (A-star) search for optimal vehicle routing
-    
-    **Components**:
-    - **Heuristic**: Manhattan distance
-    - **Cost Function**: g(n) + h(n)
-    - **Open List**: Priority queue of nodes to explore
-    - **Closed List**: Visited nodes
-    
-    **Applications**:
-    - Vehicle path planning
-    - Intersection navigation
-    - Collision avoidance
-    
-    **Complexity**: O(b^d) where b=branching factor, d=depth
-    
-    ---
-    
-    ### 🚗 Vehicle Types & Color Coding
-    
-    | Vehicle | Color | Speed | Priority | Characteristics |
-    |---------|-------|-------|----------|-----------------|
-    | 🚗 Car | 🔵 Blue | 2.0 | 1 | Standard vehicle |
-    | 🚌 Bus | 🟡 Yellow | 1.2 | 2 | Higher priority, larger |
-    | 🚚 Truck | ⚪ Gray | 1.0 | 1 | Slow, large cargo |
-    | 🚑 Emergency | 🔴 Red (Flash) | 3.5 | 10 | Highest priority |
-    
-    ---
-    
-    ### 📊 Data Science Concepts
-    
-    #### 1. Real-Time Data Collection
-    - CSV logging with timestamps
-    - Queue length tracking
-    - Wait time measurements
-    - Vehicle type distribution
-    
-    #### 2. Statistical Metrics
-    - **Mean**: Average wait times
-    - **Max**: Peak queue lengths
-    - **Distribution**: Vehicle type frequencies
-    - **Throughput**: Vehicles per minute
-    
-    #### 3. Time Series Analysis
-    - Trend detection
-    - Pattern recognition
-    - Seasonal variations
-    - Anomaly detection
-    
-    #### 4. Visualization Techniques
-    - Line charts for trends
-    - Heatmaps for distribution
-    - Pie charts for proportions
-    - Bar charts for comparisons
-    
-    ---
-    
-    ### 🏗️ System Architecture
-    
-    ```
-    ┌─────────────────┐
-    │   Streamlit     │  Frontend Dashboard
-    │   Frontend      │  - Live visualization
-    └────────┬────────┘  - Control interface
-             │
-             │ HTTP/WebSocket
-             ↓
-    ┌─────────────────┐
-    │   FastAPI       │  Backend API
-    │   Backend       │  - Simulation engine
-    └────────┬────────┘  - Analytics
-             │
-             │
-    ┌────────┴────────┐
-    │  Simulation     │  Core Logic
-    │  Engine         │  - Agent AI
-    │                 │  - A* pathfinding
-    │                 │  - Data collection
-    └─────────────────┘
-    ```
-    
-    ---
-    
-    ### 🔧 API Endpoints
-    
-    #### Simulation Control
-    - `POST /simulation/start` - Start simulation
-    - `POST /simulation/pause` - Pause simulation
-    - `POST /simulation/resume` - Resume simulation
-    - `POST /simulation/stop` - Stop simulation
-    - `POST /simulation/reset` - Reset simulation
-    - `GET /simulation/state` - Get current state
-    
-    #### Analytics
-    - `GET /analytics/summary` - Get summary statistics
-    - `GET /analytics/timeseries` - Get time series data
-    - `GET /analytics/agent_decisions` - Get decision history
-    - `GET /analytics/vehicle_stats` - Get vehicle statistics
-    
-    #### Configuration
-    - `GET /simulation/config` - Get configuration
-    - `PUT /simulation/config` - Update configuration
-    - `POST /simulation/spawn_emergency` - Spawn emergency vehicle
-    
-    ---
-    
-    ### 📈 Key Performance Indicators
-    
-    1. **Average Wait Time**: Lower is better
-    2. **Throughput**: Vehicles per minute
-    3. **Queue Length**: Peak and average
-    4. **Emergency Response Time**: Critical metric
-    5. **Agent Decision Efficiency**: Rule utilization
-    
-    ---
-    
-    ### 🎯 Project Highlights
-    
-    ✅ **Intelligent Agents**: Rule-based decision making with priority handling
-    
-    ✅ **A* Algorithm**: Optimal pathfinding for vehicle navigation
-    
-    ✅ **Real-Time Data**: Live collection and streaming
-    
-    ✅ **Statistical Analysis**: Comprehensive metrics and KPIs
-    
-    ✅ **Visualization**: Interactive dashboards with Plotly
-    
-    ✅ **Scalable Architecture**: FastAPI backend + Streamlit frontend
-    
-    """)
-
-# ==================== AUTO-REFRESH ====================
-
-if st.session_state.auto_refresh:
-    time.sleep(refresh_interval)
-    st.rerun()
+    st.markdown(DOCUMENTATION_MD)
 
 # ==================== FOOTER ====================
 
@@ -4,18 +4,25 @@ Shows actual vehicle movement on an intersection canvas
 """
 
 import streamlit as st
+from streamlit_autorefresh import st_autorefresh
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import orjson
+import threading
 import time
-import json
-from datetime import datetime
 
 # ==================== CONFIGURATION ====================
 
 API_BASE_URL = "http://localhost:8000"
+API_TIMEOUT = (0.5, 2.0)  # (connect, read) seconds - a stalled backend must not freeze the UI
+MAX_REFRESH_INTERVAL = 5.0  # Upper bound for the idle back-off, seconds
+STREAM_READ_TIMEOUT = 5.0  # Backend sends a keep-alive every second, so silence this long means a dead stream
+STREAM_RETRY_DELAY = 1.0  # Pause before reconnecting a dropped stream, seconds
+QUEUE_BAR_MAX = 15  # Queue length the bar chart axis always covers
+VEHICLE_LABEL_LIMIT = 30  # Above this many vehicles of a type, draw markers without ID labels
 st.set_page_config(
     page_title="Smart Traffic Controller - Visual",
     page_icon="🚦",
@@ -24,7 +31,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -44,24 +51,73 @@ st.markdown("""
         height: 600px;
         position: relative;
     }
+    .status-table {
+        width: 100%;
+        text-align: center;
+    }
+    .status-table th {
+        color: gray;
+        font-weight: normal;
+    }
+    .status-table td {
+        font-size: 1.8rem;
+        font-weight: bold;
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Static page chrome, emitted as one markdown element each
+HEADER_MD = """
+<h1 class="main-header">🚦 SMART TRAFFIC CONTROLLER - VISUAL SIMULATION</h1>
+
+### Real-Time Vehicle Movement Visualization
+
+---
+"""
+
+LEGEND_MD = """
+- 🔵 **Square**: Car (Blue/Orange)
+- 🟡 **Diamond**: Bus (Yellow/Orange)
+- ⚪ **Circle**: Truck (White/Orange)
+- 🔴 **Triangle**: Emergency (Red)
+
+**Orange** = Vehicle is waiting
+**Original color** = Vehicle is moving
+"""
+
+# Status row, filled from the state each frame and sent as a single element
+STATUS_TABLE_HTML = """
+<table class="status-table">
+    <tr><th>⏱️ Simulation Time</th><th>🚗 Active Vehicles</th><th>✅ Crossed</th><th>⏳ Avg Wait Time</th></tr>
+    <tr><td>{sim_time:.1f}s</td><td>{active_vehicles}</td><td>{crossed}</td><td>{avg_wait_time:.1f}s</td></tr>
+</table>
+"""
+
+FOOTER_MD = """
+---
+
+<div style='text-align: center; color: gray; padding: 1rem;'>
+    <p>🚦 Smart Traffic Light Controller - Visual Simulation</p>
+    <p>Real-Time Vehicle Movement & AI Decision Making</p>
+</div>
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # ==================== API HELPERS ====================
 
+# Shared keep-alive session so each poll reuses a pooled connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def api_call(endpoint, method="GET", data=None):
     """Make API call with error handling"""
     try:
         url = f"{API_BASE_URL}{endpoint}"
-        if method == "GET":
-            response = requests.get(url)
-        elif method == "POST":
-            response = requests.post(url, json=data)
-        elif method == "PUT":
-            response = requests.put(url, json=data)
+        response = SESSION.request(method, url, json=data, timeout=API_TIMEOUT)
         
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         else:
             st.error(f"API Error: {response.status_code}")
             return None
@@ -69,26 +125,112 @@ def api_call(endpoint, method="GET", data=None):
         st.error(f"Connection Error: {e}")
         return None
 
+@st.cache_resource
+def _last_state():
+    """Most recent (etag, state) pair, shared by every session for revalidation"""
+    return {'entry': (None, None)}
+
+@st.cache_data(ttl=0.3, show_spinner=False)
+def poll_simulation_state():
+    """Poll current simulation state, reusing the last body when the backend answers 304"""
+    held = _last_state()
+    etag, last_state = held['entry']
+    try:
+        headers = {"If-None-Match": etag} if etag else None
+        response = SESSION.get(f"{API_BASE_URL}/simulation/state", headers=headers, timeout=API_TIMEOUT)
+        
+        if response.status_code == 304:
+            return last_state
+        elif response.status_code == 200:
+            state = orjson.loads(response.content)
+            held['entry'] = (response.headers.get("ETag"), state)
+            return state
+        else:
+            st.error(f"API Error: {response.status_code}")
+            return None
+    except Exception as e:
+        st.error(f"Connection Error: {e}")
+        return None
+
+@st.cache_resource
+def _state_stream():
+    """Start one background reader of /simulation/stream per process; it holds the newest pushed state"""
+    holder = {'live': False, 'state': None}
+    
+    def reader():
+        while True:
+            try:
+                with requests.get(f"{API_BASE_URL}/simulation/stream", stream=True,
+                                  timeout=(API_TIMEOUT[0], STREAM_READ_TIMEOUT)) as response:
+                    response.raise_for_status()
+                    holder['live'] = True
+                    for line in response.iter_lines():
+                        if line.startswith(b"data: "):
+                            holder['state'] = orjson.loads(line[6:])
+            except (requests.RequestException, ValueError):
+                pass
+            
+            holder['live'] = False
+            time.sleep(STREAM_RETRY_DELAY)
+    
+    threading.Thread(target=reader, name="state-stream", daemon=True).start()
+    return holder
+
 def get_simulation_state():
-    """Get current simulation state"""
-    return api_call("/simulation/state")
+    """Get current simulation state: the pushed copy while the stream is live, otherwise a poll"""
+    stream = _state_stream()
+    if stream['live'] and stream['state'] is not None:
+        return stream['state']
+    return poll_simulation_state()
 
 # ==================== INTERSECTION VISUALIZATION ====================
 
-def create_intersection_view(state):
-    """Create animated intersection with moving vehicles"""
-    
-    if not state:
-        return go.Figure()
-    
-    # Create figure
+# Intersection dimensions
+ROAD_WIDTH = 200
+CANVAS_WIDTH = 1400
+CANVAS_HEIGHT = 900
+
+VEHICLE_TYPES = ['car', 'bus', 'truck', 'emergency']
+
+VEHICLE_COLORS = {
+    'car': 'blue',
+    'bus': 'yellow',
+    'truck': 'white',
+    'emergency': 'red'
+}
+
+VEHICLE_SYMBOLS = {
+    'car': 'square',
+    'bus': 'diamond',
+    'truck': 'circle',
+    'emergency': 'triangle-up'  # WebGL markers have no 'star'
+}
+
+VEHICLE_SIZES = {
+    'car': 15,
+    'bus': 25,
+    'truck': 20,
+    'emergency': 20
+}
+
+# Lane-marking dashes as one polyline; None breaks the line between dashes
+LANE_X, LANE_Y = [], []
+for i in range(0, CANVAS_WIDTH, 50):
+    LANE_X += [i, i + 30, None]
+    LANE_Y += [CANVAS_HEIGHT / 2, CANVAS_HEIGHT / 2, None]
+for i in range(0, CANVAS_HEIGHT, 50):
+    LANE_X += [CANVAS_WIDTH / 2, CANVAS_WIDTH / 2, None]
+    LANE_Y += [i, i + 30, None]
+
+# Trace layout of the static scene: lane markings, four lights, then one trace per vehicle type
+LIGHT_TRACES = [1, 2, 3, 4]
+VEHICLE_TRACES = [5, 6, 7, 8]
+
+@st.cache_resource
+def _build_static_scene():
+    """Build the intersection scene dict once: roads, markings, lights, arrows and empty vehicle traces"""
     fig = go.Figure()
     
-    # Intersection dimensions
-    ROAD_WIDTH = 200
-    CANVAS_WIDTH = 1400
-    CANVAS_HEIGHT = 900
-    
     # Draw roads (gray background)
     # Horizontal road (East-West)
     fig.add_shape(
@@ -115,133 +257,51 @@ def create_intersection_view(state):
     )
     
     # Draw lane markings
-    lane_color = "yellow"
-    
-    # Horizontal lane markings
-    for i in range(0, CANVAS_WIDTH, 50):
-        fig.add_shape(
-            type="line",
-            x0=i, y0=CANVAS_HEIGHT / 2,
-            x1=i + 30, y1=CANVAS_HEIGHT / 2,
-            line=dict(color=lane_color, width=3, dash="solid")
-        )
-    
-    # Vertical lane markings
-    for i in range(0, CANVAS_HEIGHT, 50):
-        fig.add_shape(
-            type="line",
-            x0=CANVAS_WIDTH / 2, y0=i,
-            x1=CANVAS_WIDTH / 2, y1=i + 30,
-            line=dict(color=lane_color, width=3, dash="solid")
-        )
-    
-    # Draw traffic lights
-    light = state['traffic_light']
-    
-    # North light
-    ns_color = 'green' if light['north_south'] == 'green' else 'yellow' if light['north_south'] == 'yellow' else 'red'
-    fig.add_trace(go.Scatter(
-        x=[CANVAS_WIDTH / 2 - 50],
-        y=[CANVAS_HEIGHT / 2 - ROAD_WIDTH / 2 - 30],
-        mode='markers',
-        marker=dict(size=30, color=ns_color, line=dict(color='black', width=3)),
-        name='North Light',
-        showlegend=False
-    ))
-    
-    # South light
-    fig.add_trace(go.Scatter(
-        x=[CANVAS_WIDTH / 2 + 50],
-        y=[CANVAS_HEIGHT / 2 + ROAD_WIDTH / 2 + 30],
-        mode='markers',
-        marker=dict(size=30, color=ns_color, line=dict(color='black', width=3)),
-        name='South Light',
-        showlegend=False
-    ))
-    
-    # East light
-    ew_color = 'green' if light['east_west'] == 'green' else 'yellow' if light['east_west'] == 'yellow' else 'red'
     fig.add_trace(go.Scatter(
-        x=[CANVAS_WIDTH / 2 + ROAD_WIDTH / 2 + 30],
-        y=[CANVAS_HEIGHT / 2 + 50],
-        mode='markers',
-        marker=dict(size=30, color=ew_color, line=dict(color='black', width=3)),
-        name='East Light',
+        x=LANE_X,
+        y=LANE_Y,
+        mode='lines',
+        line=dict(color='yellow', width=3),
+        hoverinfo='skip',
         showlegend=False
     ))
     
-    # West light
-    fig.add_trace(go.Scatter(
-        x=[CANVAS_WIDTH / 2 - ROAD_WIDTH / 2 - 30],
-        y=[CANVAS_HEIGHT / 2 - 50],
-        mode='markers',
-        marker=dict(size=30, color=ew_color, line=dict(color='black', width=3)),
-        name='West Light',
-        showlegend=False
-    ))
-    
-    # Draw vehicles
-    vehicle_colors = {
-        'car': 'blue',
-        'bus': 'yellow',
-        'truck': 'white',
-        'emergency': 'red'
-    }
-    
-    vehicle_symbols = {
-        'car': 'square',
-        'bus': 'diamond',
-        'truck': 'circle',
-        'emergency': 'star'
-    }
-    
-    vehicle_sizes = {
-        'car': 15,
-        'bus': 25,
-        'truck': 20,
-        'emergency': 20
-    }
-    
-    # Group vehicles by type for better visualization
-    for v_type in ['car', 'bus', 'truck', 'emergency']:
-        vehicles_of_type = [v for v in state['vehicles'] if v['type'] == v_type]
-        
-        if vehicles_of_type:
-            x_positions = [v['position']['x'] for v in vehicles_of_type]
-            y_positions = [CANVAS_HEIGHT - v['position']['y'] for v in vehicles_of_type]  # Invert Y
-            
-            # Create hover text
-            hover_texts = [
-                f"ID: {v['id']}<br>"
-                f"Type: {v['type'].upper()}<br>"
-                f"Direction: {v['direction']}<br>"
-                f"Wait Time: {v['wait_time']:.1f}s<br>"
-                f"Status: {'WAITING' if v['waiting'] else 'MOVING'}"
-                for v in vehicles_of_type
-            ]
-            
-            # Different appearance for waiting vs moving
-            colors = [vehicle_colors[v_type] if not v['waiting'] else 'orange' for v in vehicles_of_type]
-            
-            fig.add_trace(go.Scatter(
-                x=x_positions,
-                y=y_positions,
-                mode='markers+text',
-                marker=dict(
-                    size=vehicle_sizes[v_type],
-                    color=colors,
-                    symbol=vehicle_symbols[v_type],
-                    line=dict(color='black', width=2),
-                    opacity=0.9
-                ),
-                text=[v['id'] for v in vehicles_of_type],
-                textposition='middle center',
-                textfont=dict(size=8, color='white', family='Arial Black'),
-                hovertext=hover_texts,
-                hoverinfo='text',
-                name=f"{v_type.capitalize()}s",
-                showlegend=True
-            ))
+    # Traffic lights (colors are restyled every frame)
+    light_positions = [
+        ('North Light', CANVAS_WIDTH / 2 - 50, CANVAS_HEIGHT / 2 - ROAD_WIDTH / 2 - 30),
+        ('South Light', CANVAS_WIDTH / 2 + 50, CANVAS_HEIGHT / 2 + ROAD_WIDTH / 2 + 30),
+        ('East Light', CANVAS_WIDTH / 2 + ROAD_WIDTH / 2 + 30, CANVAS_HEIGHT / 2 + 50),
+        ('West Light', CANVAS_WIDTH / 2 - ROAD_WIDTH / 2 - 30, CANVAS_HEIGHT / 2 - 50)
+    ]
+    
+    for name, x, y in light_positions:
+        fig.add_trace(go.Scatter(
+            x=[x],
+            y=[y],
+            mode='markers',
+            marker=dict(size=30, color='red', line=dict(color='black', width=3)),
+            name=name,
+            showlegend=False
+        ))
+    
+    # One WebGL trace per vehicle type, filled in every frame
+    for v_type in VEHICLE_TYPES:
+        fig.add_trace(go.Scattergl(
+            x=[],
+            y=[],
+            mode='markers+text',
+            marker=dict(
+                size=VEHICLE_SIZES[v_type],
+                symbol=VEHICLE_SYMBOLS[v_type],
+                line=dict(color='black', width=2),
+                opacity=0.9
+            ),
+            textposition='middle center',
+            textfont=dict(size=8, color='white', family='Arial Black'),
+            hoverinfo='text',
+            name=f"{v_type.capitalize()}s",
+            showlegend=True
+        ))
     
     # Direction arrows
     arrow_positions = {
@@ -286,9 +346,105 @@ def create_intersection_view(state):
             borderwidth=2
         ),
         hovermode='closest',
-        margin=dict(l=10, r=150, t=10, b=10)
+        margin=dict(l=10, r=150, t=10, b=10),
+        uirevision='intersection'  # Keep zoom/legend state across frames
     )
     
+    return fig.to_dict()
+
+def _fill_trace(data, index, color, **props):
+    """Replace data[index] with a copy carrying the given marker color and properties (the cached trace is shared)"""
+    trace = data[index] = {**data[index], **props}
+    trace['marker'] = {**trace['marker'], 'color': color}
+
+def _update_vehicles(data, state):
+    """Fill the current light colors and vehicle arrays into the frame's trace list"""
+    light = state['traffic_light']
+    ns_color = 'green' if light['north_south'] == 'green' else 'yellow' if light['north_south'] == 'yellow' else 'red'
+    ew_color = 'green' if light['east_west'] == 'green' else 'yellow' if light['east_west'] == 'yellow' else 'red'
+    for index, color in zip(LIGHT_TRACES, (ns_color, ns_color, ew_color, ew_color)):
+        _fill_trace(data, index, color)
+    
+    xs, ys, colors, texts, modes, hover, shown = [], [], [], [], [], [], []
+    
+    # Flatten vehicles into columns and derive every per-vehicle attribute in one frame-wide pass;
+    # the groupby then only slices the finished columns per type
+    df = pd.json_normalize(state['vehicles'])
+    groups = {}
+    
+    if not df.empty:
+        waiting = df['waiting'].to_numpy(dtype=bool)
+        
+        # Whole pixels are enough on a 1400x900 canvas and serialize far smaller than doubles
+        df['x'] = df['position.x'].to_numpy().astype(np.int16)
+        df['y'] = (CANVAS_HEIGHT - df['position.y'].to_numpy()).astype(np.int16)  # Invert Y
+        
+        # Different appearance for waiting vs moving
+        df['color'] = np.where(waiting, 'orange', df['type'].map(VEHICLE_COLORS))
+        
+        # Create hover text
+        df['hover'] = (
+            "ID: " + df['id'].astype(str) +
+            "<br>Type: " + df['type'].str.upper() +
+            "<br>Direction: " + df['direction'] +
+            "<br>Wait Time: " + df['wait_time'].map('{:.1f}'.format) + "s" +
+            "<br>Status: " + np.where(waiting, 'WAITING', 'MOVING')
+        )
+        groups = dict(tuple(df.groupby('type')))
+    
+    for v_type in VEHICLE_TYPES:
+        group = groups.get(v_type)
+        
+        if group is None:
+            xs.append([])
+            ys.append([])
+            colors.append([])
+            texts.append([])
+            modes.append('markers')
+            hover.append([])
+            shown.append(False)
+            continue
+        
+        xs.append(group['x'].to_numpy())
+        ys.append(group['y'].to_numpy())
+        colors.append(group['color'].to_numpy())
+        
+        # ID labels only while they stay legible; hovertext carries the full details either way
+        if len(group) <= VEHICLE_LABEL_LIMIT:
+            texts.append(group['id'].tolist())
+            modes.append('markers+text')
+        else:
+            texts.append([])
+            modes.append('markers')
+        
+        hover.append(group['hover'].to_numpy())
+        shown.append(True)
+    
+    for i, index in enumerate(VEHICLE_TRACES):
+        _fill_trace(data, index, colors[i], x=xs[i], y=ys[i], text=texts[i], mode=modes[i],
+                    hovertext=hover[i], showlegend=shown[i])
+
+def create_intersection_view(state):
+    """Create animated intersection with moving vehicles"""
+    
+    if not state:
+        return go.Figure()
+    
+    # Same tick as the last frame (paused, or polled faster than the sim steps): reuse it
+    frame_key = (state['sim_time'], len(state['vehicles']))
+    if frame_key == st.session_state.get('_fig_key'):
+        return st.session_state['_fig']
+    
+    # Shallow-copy the cached scene's trace list; only the light and vehicle traces are replaced
+    scene = _build_static_scene()
+    data = list(scene['data'])
+    _update_vehicles(data, state)
+    
+    # The scene was validated when it was built, so skip re-validating it every frame
+    fig = go.Figure({'data': data, 'layout': scene['layout']}, _validate=False)
+    
+    st.session_state['_fig_key'] = frame_key
+    st.session_state['_fig'] = fig
     return fig
 
 # ==================== INITIALIZATION ====================
@@ -297,12 +453,13 @@ if 'simulation_running' not in st.session_state:
     st.session_state.simulation_running = False
 if 'auto_refresh' not in st.session_state:
     st.session_state.auto_refresh = False  # Disabled by default - enable to see animation
+if 'last_sim_time' not in st.session_state:
+    st.session_state.last_sim_time = None
+    st.session_state.current_interval = None
 
 # ==================== HEADER ====================
 
-st.markdown('<h1 class="main-header">🚦 SMART TRAFFIC CONTROLLER - VISUAL SIMULATION</h1>', unsafe_allow_html=True)
-st.markdown("### Real-Time Vehicle Movement Visualization")
-st.markdown("---")
+st.markdown(HEADER_MD, unsafe_allow_html=True)
 
 # ==================== SIDEBAR CONTROLS ====================
 
@@ -318,6 +475,7 @@ with st.sidebar:
         if st.button("▶️ Start", use_container_width=True):
             result = api_call("/simulation/start", "POST")
             if result:
+                st.cache_data.clear()
                 st.session_state.simulation_running = True
                 st.success("Simulation started!")
     
@@ -325,6 +483,7 @@ with st.sidebar:
         if st.button("⏹️ Stop", use_container_width=True):
             result = api_call("/simulation/stop", "POST")
             if result:
+                st.cache_data.clear()
                 st.session_state.simulation_running = False
                 st.success("Simulation stopped!")
     
@@ -345,6 +504,8 @@ with st.sidebar:
     if st.button("🔄 Reset", use_container_width=True):
         result = api_call("/simulation/reset", "POST")
         if result:
+            st.cache_data.clear()
+            st.session_state.pop('_fig_key', None)
             st.session_state.simulation_running = False
             st.success("Simulation reset!")
     
@@ -362,21 +523,23 @@ with st.sidebar:
     # Configuration
     st.subheader("⚙️ Configuration")
     
-    spawn_rate = st.slider("Vehicle Spawn Rate (s)", 0.5, 5.0, 2.0, 0.5)
-    max_vehicles = st.slider("Max Vehicles", 20, 150, 80, 10)
-    green_time = st.slider("Green Light Duration (s)", 15, 60, 30, 5)
-    
-    if st.button("Apply Config", use_container_width=True):
-        config = {
-            "spawn_rate": spawn_rate,
-            "max_vehicles": max_vehicles,
-            "green_time": green_time,
-            "queue_threshold": 10,
-            "wait_threshold": 60
-        }
-        result = api_call("/simulation/config", "PUT", config)
-        if result:
-            st.success("Configuration updated!")
+    # Sliders inside a form don't rerun the script until Apply is pressed
+    with st.form("config_form", clear_on_submit=False):
+        spawn_rate = st.slider("Vehicle Spawn Rate (s)", 0.5, 5.0, 2.0, 0.5)
+        max_vehicles = st.slider("Max Vehicles", 20, 150, 80, 10)
+        green_time = st.slider("Green Light Duration (s)", 15, 60, 30, 5)
+        
+        if st.form_submit_button("Apply Config", use_container_width=True):
+            config = {
+                "spawn_rate": spawn_rate,
+                "max_vehicles": max_vehicles,
+                "green_time": green_time,
+                "queue_threshold": 10,
+                "wait_threshold": 60
+            }
+            result = api_call("/simulation/config", "PUT", config)
+            if result:
+                st.success("Configuration updated!")
     
     st.markdown("---")
     
@@ -394,16 +557,8 @@ with st.sidebar:
     st.markdown("---")
     
     # Legend
-    st.subheader("🎨 Vehicle Legend")
-    st.markdown("""
-    - 🔵 **Square**: Car (Blue/Orange)
-    - 🟡 **Diamond**: Bus (Yellow/Orange)
-    - ⚪ **Circle**: Truck (White/Orange)
-    - 🔴 **Star**: Emergency (Red)
-    
-    **Orange** = Vehicle is waiting
-    **Original color** = Vehicle is moving
-    """)
+    with st.expander("🎨 Vehicle Legend", expanded=False):
+        st.markdown(LEGEND_MD)
 
 # ==================== MAIN CONTENT ====================
 
@@ -412,20 +567,13 @@ state = get_simulation_state()
 
 if state:
     # Status row
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("⏱️ Simulation Time", f"{state['sim_time']:.1f}s")
-    
-    with col2:
-        metrics = state.get('metrics', {})
-        st.metric("🚗 Active Vehicles", metrics.get('active_vehicles', 0))
-    
-    with col3:
-        st.metric("✅ Crossed", metrics.get('crossed', 0))
-    
-    with col4:
-        st.metric("⏳ Avg Wait Time", f"{metrics.get('avg_wait_time', 0):.1f}s")
+    metrics = state.get('metrics', {})
+    st.markdown(STATUS_TABLE_HTML.format(
+        sim_time=state['sim_time'],
+        active_vehicles=metrics.get('active_vehicles', 0),
+        crossed=metrics.get('crossed', 0),
+        avg_wait_time=metrics.get('avg_wait_time', 0)
+    ), unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -438,7 +586,7 @@ if state:
     
     # Create and display intersection
     intersection_fig = create_intersection_view(state)
-    st.plotly_chart(intersection_fig, use_container_width=True, key=f"intersection_{state['sim_time']}")
+    st.plotly_chart(intersection_fig, use_container_width=True, key="intersection")
     
     st.markdown("---")
     
@@ -464,20 +612,24 @@ if state:
     # Queue lengths
     st.subheader("📊 Queue Lengths by Direction")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
     directions = ['north', 'south', 'east', 'west']
     icons = ['⬆️', '⬇️', '➡️', '⬅️']
-    
-    for col, direction, icon in zip([col1, col2, col3, col4], directions, icons):
-        with col:
-            queue_length = metrics.get(f'queue_{direction}', 0)
-            st.metric(
-                f"{icon} {direction.capitalize()}",
-                queue_length
-            )
-            progress = min(queue_length / 15, 1.0)
-            st.progress(progress)
+    queue_lengths = [metrics.get(f'queue_{direction}', 0) for direction in directions]
+    
+    # One bar chart in place of four metric + progress pairs
+    queue_fig = go.Figure(go.Bar(
+        x=[f"{icon} {direction.capitalize()}" for direction, icon in zip(directions, icons)],
+        y=queue_lengths,
+        text=queue_lengths,
+        textposition='outside',
+        marker_color='#0984e3'
+    ))
+    queue_fig.update_layout(
+        height=250,
+        yaxis=dict(range=[0, max(QUEUE_BAR_MAX, *queue_lengths) + 2]),
+        margin=dict(l=10, r=10, t=10, b=10)
+    )
+    st.plotly_chart(queue_fig, use_container_width=True, key="queues")
 
 else:
     st.warning("⚠️ No simulation data available. Start the simulation to see live visualization.")
@@ -502,16 +654,19 @@ else:
 
 # ==================== AUTO-REFRESH ====================
 
+# Browser-side timer triggers the rerun, so the script never blocks in a sleep
 if st.session_state.auto_refresh:
-    time.sleep(refresh_interval)
-    st.rerun()
+    # Back off while sim_time is frozen (paused/stopped); snap back to the slider once it moves
+    sim_time = state['sim_time'] if state else None
+    if sim_time is not None and sim_time != st.session_state.last_sim_time:
+        st.session_state.current_interval = refresh_interval
+    else:
+        current = max(st.session_state.current_interval or refresh_interval, refresh_interval)
+        st.session_state.current_interval = min(current * 2, MAX_REFRESH_INTERVAL)
+    st.session_state.last_sim_time = sim_time
+    
+    st_autorefresh(interval=int(st.session_state.current_interval * 1000), key="refresh_poll")
 
 # ==================== FOOTER ====================
 
-st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: gray; padding: 1rem;'>
-    <p>🚦 Smart Traffic Light Controller - Visual Simulation</p>
-    <p>Real-Time Vehicle Movement & AI Decision Making</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_MD, unsafe_allow_html=True)
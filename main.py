@@ -3,20 +3,22 @@ FastAPI Backend for Smart Traffic Light Controller
 Provides REST API for simulation control and data analytics
 """
 
-from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks
+from fastapi import FastAPI, WebSocket, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
-import pandas as pd
 import numpy as np
-from datetime import datetime
+from numba import njit
 import asyncio
-import json
-from collections import deque
+import orjson
+from bisect import bisect_right
 import random
+import threading
 import time
+import uuid
 
-app = FastAPI(title="Smart Traffic API", version="1.0.0")
+app = FastAPI(title="Smart Traffic API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware for Streamlit
 app.add_middleware(
@@ -53,11 +55,11 @@ class SimulationState(BaseModel):
     metrics: Dict
 
 class SimulationConfig(BaseModel):
-    spawn_rate: float = 2.0
-    max_vehicles: int = 80
-    green_time: int = 30
-    queue_threshold: int = 10
-    wait_threshold: int = 60
+    spawn_rate: float = Field(2.0, gt=0)  # Mean seconds between spawns
+    max_vehicles: int = Field(80, ge=1, le=10_000)
+    green_time: int = Field(30, ge=1)
+    queue_threshold: int = Field(10, ge=0)
+    wait_threshold: int = Field(60, ge=0)
 
 class AnalyticsQuery(BaseModel):
     start_time: Optional[float] = None
@@ -66,17 +68,154 @@ class AnalyticsQuery(BaseModel):
 
 # ==================== SIMULATION ENGINE ====================
 
+# Integer codes used by the vehicle arrays; tuple position is the code
+DIRECTIONS = ('north', 'south', 'east', 'west')
+VEHICLE_TYPES = ('car', 'bus', 'truck', 'emergency')
+EMERGENCY = VEHICLE_TYPES.index('emergency')
+VEHICLE_PRIORITY = (1, 2, 1, 10)  # Indexed by type code
+
+# Spawn mix: a uniform draw below SPAWN_TYPE_CDF[k] picks SPAWN_TYPE_CODES[k]
+SPAWN_TYPE_CDF = (0.05, 0.20, 0.35, 1.0)
+SPAWN_TYPE_CODES = (EMERGENCY, VEHICLE_TYPES.index('bus'), VEHICLE_TYPES.index('truck'), VEHICLE_TYPES.index('car'))
+
+RNG_BATCH = 4096  # Random draws generated per refill
+
+# Entry point (x, y) per direction code
+SPAWN_POS = np.array([[700, 900], [700, 0], [0, 450], [1400, 450]], dtype=np.float64)
+
+# Unit movement per direction code
+DIR_DX = np.array([0, 0, 1, -1], dtype=np.float64)
+DIR_DY = np.array([-1, 1, 0, 0], dtype=np.float64)
+
+VEHICLE_SPEED = 2 * 60  # Pixels per second (2 px per frame at 60 FPS)
+
+# A vehicle has crossed once it leaves this box
+EXIT_X_MIN, EXIT_X_MAX = -50, 1450
+EXIT_Y_MIN, EXIT_Y_MAX = -50, 950
+
+# One array per vehicle field (struct-of-arrays); rows [0, n_vehicles) are the active vehicles in spawn order
+VEHICLE_COLUMNS = {
+    'ids': np.int64,
+    'pos_x': np.float64,
+    'pos_y': np.float64,
+    'dir_idx': np.int8,
+    'type_idx': np.int8,
+    'wait_time': np.float64,
+    'waiting': np.bool_,
+    'crossed': np.bool_,
+    'priority': np.int16,
+    'spawn_time': np.float64
+}
+
+# Metrics log layout: one float64 column per field, lights stored as LIGHT_STATES codes
+METRIC_FIELDS = (
+    'timestamp', 'active_vehicles', 'total_processed', 'crossed',
+    'queue_north', 'queue_south', 'queue_east', 'queue_west',
+    'avg_wait_time', 'light_ns', 'light_ew', 'emergency_active'
+)
+METRIC_INDEX = {name: i for i, name in enumerate(METRIC_FIELDS)}
+INT_METRICS = {'active_vehicles', 'total_processed', 'crossed', 'queue_north', 'queue_south', 'queue_east', 'queue_west'}
+DECISION_CAPACITY = 100  # Most recent agent decisions kept
+METRICS_CAPACITY = 100_000  # Rows kept (~2.8h of sim time at 10 Hz); the oldest half is dropped when full
+LIGHT_STATES = ('green', 'yellow', 'red')
+LIGHT_CODES = {state: i for i, state in enumerate(LIGHT_STATES)}
+
+# Light cycle as (north_south, east_west, base duration) per phase, advanced cyclically
+LIGHT_PHASES = (
+    ('green', 'red', 30),
+    ('yellow', 'red', 5),
+    ('red', 'green', 30),
+    ('red', 'yellow', 5)
+)
+PHASE_LIGHT_CODES = tuple((LIGHT_CODES[ns], LIGHT_CODES[ew]) for ns, ew, _ in LIGHT_PHASES)
+# Green flag per (phase, direction code)
+PHASE_CAN_GO = np.array([[ns == 'green'] * 2 + [ew == 'green'] * 2 for ns, ew, _ in LIGHT_PHASES])
+
+def metrics_records(fields, block):
+    """Materialize a metrics_block copy as API dicts, one per row"""
+    columns = [metric_values(name, block[:, i]) for i, name in enumerate(fields)]
+    return [dict(zip(fields, row)) for row in zip(*columns)]
+
+def metric_values(name, column):
+    """Decode one stored metrics column back into its API values"""
+    if name in ('light_ns', 'light_ew'):
+        return [LIGHT_STATES[code] for code in column.astype(np.int8).tolist()]
+    if name == 'emergency_active':
+        return column.astype(bool).tolist()
+    if name in INT_METRICS:
+        return column.astype(np.int64).tolist()
+    return column.tolist()
+
+@njit(cache=True, fastmath=True)
+def _step_vehicles(pos_x, pos_y, dir_idx, type_idx, crossed, waiting, wait_time,
+                   queue_count, wait_sum, can_go_ns, can_go_ew, dt, n):
+    """Advance rows [0, n) one tick: wait at a red light, otherwise move and check the exit bounds.
+    
+    Keeps the per-direction queue_count/wait_sum totals in step and returns the direction of the
+    last waiting emergency vehicle (-1 if none) for the next perception.
+    """
+    step = VEHICLE_SPEED * dt
+    emergency_dir = -1
+    
+    for i in range(n):
+        if crossed[i]:
+            continue
+        
+        d = dir_idx[i]
+        can_go = can_go_ns if d < 2 else can_go_ew
+        
+        if not can_go:
+            waiting[i] = True
+            wait_time[i] += dt
+            wait_sum[d] += dt
+            if type_idx[i] == EMERGENCY:
+                emergency_dir = d
+        else:
+            waiting[i] = False
+            pos_x[i] += step * DIR_DX[d]
+            pos_y[i] += step * DIR_DY[d]
+            
+            if pos_y[i] < EXIT_Y_MIN or pos_y[i] > EXIT_Y_MAX or pos_x[i] < EXIT_X_MIN or pos_x[i] > EXIT_X_MAX:
+                crossed[i] = True
+                queue_count[d] -= 1
+                # Snap to zero on an empty queue so rounding can't accumulate
+                wait_sum[d] = wait_sum[d] - wait_time[i] if queue_count[d] else 0.0
+    
+    return emergency_dir
+
 class SimulationEngine:
     """Lightweight simulation engine for backend"""
     
-    def __init__(self):
-        self.vehicles = []
+    def __init__(self, seed=None):
+        self.run_id = uuid.uuid4().hex  # Lets clients tell a reset backend from the run they were following
         self.vehicle_count = 0
         self.sim_time = 0
         self.running = False
         self.paused = False
         
-        self.config = SimulationConfig()
+        self.apply_config(SimulationConfig())
+        
+        # Vehicle storage: parallel arrays, grown geometrically when full
+        self.n_vehicles = 0
+        for name, dtype in VEHICLE_COLUMNS.items():
+            setattr(self, name, np.zeros(self.max_vehicles, dtype=dtype))
+        
+        # Per-direction totals over active vehicles, maintained on spawn/wait/cross
+        self._queue_count = np.zeros(4, dtype=np.int32)
+        self._wait_sum = np.zeros(4, dtype=np.float64)
+        self._emergency_dir = -1
+        
+        # Spawn totals by type and direction over the whole run, behind /analytics/vehicle_stats
+        self._count_by_type = np.zeros(4, dtype=np.int64)
+        self._count_by_dir = np.zeros(4, dtype=np.int64)
+        
+        # Random draws come from pre-generated batches instead of one RNG call each
+        self._rng = np.random.default_rng(seed)
+        self._refill_spawn_draws()
+        self._refill_arrival_draws()
+        
+        # Arrival time of the next spawn (exponential inter-arrival, mean spawn_rate)
+        self._next_spawn_t = self._next_interarrival()
         
         # Traffic light state
         self.light_state = {
@@ -86,85 +225,150 @@ class SimulationEngine:
             'phase_duration': 30,
             'emergency_mode': False
         }
+        self._set_phase(0)
+        
+        # Held by the simulation thread for each step and by endpoints that read or mutate engine arrays
+        self.lock = threading.Lock()
         
         # Agent state
         self.agent_decision = "Initializing..."
-        self.decision_history = deque(maxlen=100)
-        
-        # Data storage
-        self.data_log = []
-        self.metrics_history = deque(maxlen=1000)
+        self._decisions = [None] * DECISION_CAPACITY  # Ring buffer; _decisions_head is the next slot
+        self._decisions_head = 0
+        self._decisions_count = 0
+        
+        # Data storage: bounded columnar metrics log, grown geometrically up to METRICS_CAPACITY
+        self.metrics_log = np.empty((1024, len(METRIC_FIELDS)), dtype=np.float64)
+        self.metrics_n = 0
+        self.latest_metrics = {}
+        
+        # Whole-run running aggregates behind /analytics/summary, updated per logged row
+        self._agg = {
+            'rows': 0,
+            'wait_sum': 0.0,
+            'wait_max': 0.0,
+            'queue_sums': [0, 0, 0, 0],
+            'queue_max': 0,
+            'crossed_max': 0,
+            'emergency_rows': 0
+        }
         
+        self.publish()
+    
+    def apply_config(self, config):
+        """Store the config model for the API and copy the values the tick reads into plain attributes"""
+        self.config = config
+        self.spawn_rate = config.spawn_rate
+        self.max_vehicles = config.max_vehicles
+        self.queue_threshold = config.queue_threshold
+        self.wait_threshold = config.wait_threshold
+    
     def spawn_vehicle(self):
         """Spawn new vehicle"""
-        if len(self.vehicles) >= self.config.max_vehicles:
+        if self.n_vehicles >= self.max_vehicles:
             return
         
-        self.vehicle_count += 1
+        # Random type and direction
+        if self._spawn_draw_idx == RNG_BATCH:
+            self._refill_spawn_draws()
+        i = self._spawn_draw_idx
+        self._spawn_draw_idx += 1
         
-        # Random type
-        rand = random.random()
-        if rand < 0.05:
-            v_type, priority = 'emergency', 10
-        elif rand < 0.20:
-            v_type, priority = 'bus', 2
-        elif rand < 0.35:
-            v_type, priority = 'truck', 1
-        else:
-            v_type, priority = 'car', 1
-        
-        direction = random.choice(['north', 'south', 'east', 'west'])
-        
-        vehicle = {
-            'id': self.vehicle_count,
-            'type': v_type,
-            'direction': direction,
-            'position': self._get_spawn_position(direction),
-            'waiting': False,
-            'wait_time': 0,
-            'crossed': False,
-            'priority': priority,
-            'spawn_time': self.sim_time
-        }
+        type_idx = SPAWN_TYPE_CODES[bisect_right(SPAWN_TYPE_CDF, self._type_draws[i])]
+        self.add_vehicle(type_idx, self._dir_draws[i])
+    
+    def _refill_spawn_draws(self):
+        """Pre-draw type uniforms and direction codes for the next RNG_BATCH spawns"""
+        self._type_draws = self._rng.random(RNG_BATCH).tolist()
+        self._dir_draws = self._rng.integers(0, 4, RNG_BATCH).tolist()
+        self._spawn_draw_idx = 0
+    
+    def _refill_arrival_draws(self):
+        """Pre-draw unit exponentials for the next RNG_BATCH inter-arrival gaps"""
+        self._arrival_draws = self._rng.standard_exponential(RNG_BATCH).tolist()
+        self._arrival_draw_idx = 0
+    
+    def _next_interarrival(self):
+        """Next exponential gap, scaled by the current spawn_rate so config changes apply immediately"""
+        if self._arrival_draw_idx == RNG_BATCH:
+            self._refill_arrival_draws()
+        gap = self._arrival_draws[self._arrival_draw_idx]
+        self._arrival_draw_idx += 1
+        return gap * self.spawn_rate
+    
+    def add_vehicle(self, type_idx, dir_idx):
+        """Append one vehicle row at its spawn point and return its id"""
+        if self.n_vehicles == len(self.ids):
+            self._grow_vehicles()
         
-        self.vehicles.append(vehicle)
+        self.vehicle_count += 1
+        i = self.n_vehicles
+        
+        self.ids[i] = self.vehicle_count
+        self.pos_x[i], self.pos_y[i] = SPAWN_POS[dir_idx]
+        self.dir_idx[i] = dir_idx
+        self.type_idx[i] = type_idx
+        self.wait_time[i] = 0
+        self.waiting[i] = False
+        self.crossed[i] = False
+        self.priority[i] = VEHICLE_PRIORITY[type_idx]
+        self.spawn_time[i] = self.sim_time
+        
+        self._queue_count[dir_idx] += 1
+        self._count_by_type[type_idx] += 1
+        self._count_by_dir[dir_idx] += 1
+        self.n_vehicles += 1
+        return self.vehicle_count
     
-    def _get_spawn_position(self, direction):
-        """Get spawn position based on direction"""
-        positions = {
-            'north': {'x': 700, 'y': 900},
-            'south': {'x': 700, 'y': 0},
-            'east': {'x': 0, 'y': 450},
-            'west': {'x': 1400, 'y': 450}
-        }
-        return positions[direction]
+    def _grow_vehicles(self):
+        """Double the capacity of every vehicle array"""
+        capacity = max(2 * len(self.ids), 1)
+        for name in VEHICLE_COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.n_vehicles] = old[:self.n_vehicles]
+            setattr(self, name, new)
+    
+    def _compact_vehicles(self):
+        """Drop crossed rows in place, keeping the remaining rows in spawn order"""
+        keep = np.flatnonzero(~self.crossed[:self.n_vehicles])
+        for name in VEHICLE_COLUMNS:
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+        self.n_vehicles = len(keep)
+    
+    def vehicle_dicts(self, rows):
+        """Materialize the given row indices as API dicts (only at the output boundary)"""
+        return [
+            {
+                'id': vid,
+                'type': VEHICLE_TYPES[t],
+                'direction': DIRECTIONS[d],
+                'position': {'x': x, 'y': y},
+                'waiting': w,
+                'wait_time': wt,
+                'crossed': c,
+                'priority': p
+            }
+            for vid, t, d, x, y, w, wt, c, p in zip(
+                self.ids[rows].tolist(), self.type_idx[rows].tolist(), self.dir_idx[rows].tolist(),
+                self.pos_x[rows].tolist(), self.pos_y[rows].tolist(), self.waiting[rows].tolist(),
+                self.wait_time[rows].tolist(), self.crossed[rows].tolist(), self.priority[rows].tolist()
+            )
+        ]
     
     def perceive_environment(self):
         """Agent perception"""
-        queues = {'north': [], 'south': [], 'east': [], 'west': []}
-        emergency_present = False
-        emergency_dir = None
-        
-        for v in self.vehicles:
-            if not v['crossed']:
-                queues[v['direction']].append(v)
-                if v['type'] == 'emergency' and v['waiting']:
-                    emergency_present = True
-                    emergency_dir = v['direction']
-        
-        queue_lengths = {d: len(queues[d]) for d in queues}
-        avg_wait_times = {}
-        
-        for d in queues:
-            if queues[d]:
-                avg_wait_times[d] = sum(v['wait_time'] for v in queues[d]) / len(queues[d])
-            else:
-                avg_wait_times[d] = 0
+        counts = self._queue_count
+        avg_waits = np.divide(self._wait_sum, counts, out=np.zeros(4), where=counts > 0)
+        
+        # Last waiting emergency vehicle in spawn order decides the direction
+        emergency_dir = DIRECTIONS[self._emergency_dir] if self._emergency_dir >= 0 else None
         
+        # Per-direction arrays, indexed by direction code
         return {
-            'queues': queue_lengths,
-            'wait_times': avg_wait_times,
-            'emergency': emergency_present,
+            'queues': counts.copy(),
+            'wait_times': avg_waits,
+            'emergency': emergency_dir is not None,
             'emergency_dir': emergency_dir
         }
     
@@ -186,39 +390,42 @@ class SimulationEngine:
                 'action': f"green_{perception['emergency_dir']}",
                 'reason': 'Emergency vehicle detected'
             })
-            self.decision_history.append(decision_info)
+            self.record_decision(decision_info)
             return
         
         if self.light_state['emergency_mode'] and not perception['emergency']:
             self.deactivate_emergency()
         
-        # Rule 2: High queue - extend green
-        for direction in perception['queues']:
-            if perception['queues'][direction] > self.config.queue_threshold:
-                if self.can_go(direction):
-                    self.light_state['phase_duration'] += 10
-                    self.agent_decision = f"Extending green for {direction} (+10s) - Queue: {perception['queues'][direction]}"
-                    decision_info.update({
-                        'type': 'queue_extend',
-                        'action': 'extend_10s',
-                        'reason': f"High queue in {direction}: {perception['queues'][direction]} vehicles"
-                    })
-                    self.decision_history.append(decision_info)
-                    return
+        # Rules 2 and 3 only consider directions that currently have green
+        can_go = PHASE_CAN_GO[self._phase]
+        
+        # Rule 2: High queue - extend green (first qualifying direction in DIRECTIONS order)
+        hits = np.flatnonzero((perception['queues'] > self.queue_threshold) & can_go)
+        if hits.size:
+            direction, queue = DIRECTIONS[hits[0]], int(perception['queues'][hits[0]])
+            self.light_state['phase_duration'] += 10
+            self.agent_decision = f"Extending green for {direction} (+10s) - Queue: {queue}"
+            decision_info.update({
+                'type': 'queue_extend',
+                'action': 'extend_10s',
+                'reason': f"High queue in {direction}: {queue} vehicles"
+            })
+            self.record_decision(decision_info)
+            return
         
         # Rule 3: Long wait time - extend green
-        for direction in perception['wait_times']:
-            if perception['wait_times'][direction] > self.config.wait_threshold:
-                if self.can_go(direction):
-                    self.light_state['phase_duration'] += 5
-                    self.agent_decision = f"Extending green for {direction} (+5s) - Wait: {perception['wait_times'][direction]:.1f}s"
-                    decision_info.update({
-                        'type': 'wait_extend',
-                        'action': 'extend_5s',
-                        'reason': f"Long wait in {direction}: {perception['wait_times'][direction]:.1f}s"
-                    })
-                    self.decision_history.append(decision_info)
-                    return
+        hits = np.flatnonzero((perception['wait_times'] > self.wait_threshold) & can_go)
+        if hits.size:
+            direction, wait = DIRECTIONS[hits[0]], float(perception['wait_times'][hits[0]])
+            self.light_state['phase_duration'] += 5
+            self.agent_decision = f"Extending green for {direction} (+5s) - Wait: {wait:.1f}s"
+            decision_info.update({
+                'type': 'wait_extend',
+                'action': 'extend_5s',
+                'reason': f"Long wait in {direction}: {wait:.1f}s"
+            })
+            self.record_decision(decision_info)
+            return
         
         self.agent_decision = "Standard timing"
         decision_info.update({
@@ -226,17 +433,24 @@ class SimulationEngine:
             'action': 'maintain',
             'reason': 'Normal traffic conditions'
         })
-        self.decision_history.append(decision_info)
+        self.record_decision(decision_info)
+    
+    def record_decision(self, decision_info):
+        """Store a decision in the ring, overwriting the oldest once full"""
+        self._decisions[self._decisions_head] = decision_info
+        self._decisions_head = (self._decisions_head + 1) % DECISION_CAPACITY
+        self._decisions_count = min(self._decisions_count + 1, DECISION_CAPACITY)
+    
+    def decision_history(self):
+        """Recorded decisions, oldest first"""
+        if self._decisions_count < DECISION_CAPACITY:
+            return self._decisions[:self._decisions_count]
+        return self._decisions[self._decisions_head:] + self._decisions[:self._decisions_head]
     
     def activate_emergency(self, direction):
         """Activate emergency mode"""
         self.light_state['emergency_mode'] = True
-        if direction in ['north', 'south']:
-            self.light_state['north_south'] = 'green'
-            self.light_state['east_west'] = 'red'
-        else:
-            self.light_state['east_west'] = 'green'
-            self.light_state['north_south'] = 'red'
+        self._set_phase(0 if direction in ('north', 'south') else 2)
     
     def deactivate_emergency(self):
         """Deactivate emergency mode"""
@@ -245,10 +459,16 @@ class SimulationEngine:
     
     def can_go(self, direction):
         """Check if vehicle can proceed"""
-        if direction in ['north', 'south']:
-            return self.light_state['north_south'] == 'green'
-        else:
-            return self.light_state['east_west'] == 'green'
+        return self._can_go_ns if direction in ('north', 'south') else self._can_go_ew
+    
+    def _set_phase(self, phase):
+        """Switch to a LIGHT_PHASES entry: set both light colors and refresh the cached green flags"""
+        self._phase = phase
+        ns, ew, _ = LIGHT_PHASES[phase]
+        self.light_state['north_south'] = ns
+        self.light_state['east_west'] = ew
+        self._can_go_ns = ns == 'green'
+        self._can_go_ew = ew == 'green'
     
     def update_light(self, dt):
         """Update traffic light state"""
@@ -263,20 +483,9 @@ class SimulationEngine:
     
     def transition_light(self):
         """Transition between light states"""
-        if self.light_state['north_south'] == 'green':
-            self.light_state['north_south'] = 'yellow'
-            self.light_state['phase_duration'] = 5
-        elif self.light_state['north_south'] == 'yellow':
-            self.light_state['north_south'] = 'red'
-            self.light_state['east_west'] = 'green'
-            self.light_state['phase_duration'] = 30
-        elif self.light_state['east_west'] == 'green':
-            self.light_state['east_west'] = 'yellow'
-            self.light_state['phase_duration'] = 5
-        elif self.light_state['east_west'] == 'yellow':
-            self.light_state['east_west'] = 'red'
-            self.light_state['north_south'] = 'green'
-            self.light_state['phase_duration'] = 30
+        phase = (self._phase + 1) % len(LIGHT_PHASES)
+        self._set_phase(phase)
+        self.light_state['phase_duration'] = LIGHT_PHASES[phase][2]
     
     def update(self, dt):
         """Update simulation step"""
@@ -285,9 +494,10 @@ class SimulationEngine:
         
         self.sim_time += dt
         
-        # Spawn vehicles
-        if random.random() < dt / self.config.spawn_rate:
+        # Spawn vehicles: Poisson arrivals, catching up on every arrival due this tick
+        while self._next_spawn_t <= self.sim_time:
             self.spawn_vehicle()
+            self._next_spawn_t += self._next_interarrival()
         
         # Agent perception and decision
         perception = self.perceive_environment()
@@ -297,79 +507,103 @@ class SimulationEngine:
         self.update_light(dt)
         
         # Update vehicles
-        for vehicle in self.vehicles:
-            if vehicle['crossed']:
-                continue
-            
-            can_go = self.can_go(vehicle['direction'])
-            
-            # Simple distance check
-            if not can_go:
-                vehicle['waiting'] = True
-                vehicle['wait_time'] += dt
-            else:
-                vehicle['waiting'] = False
-                # Move vehicle
-                if vehicle['direction'] == 'north':
-                    vehicle['position']['y'] -= 2 * dt * 60
-                elif vehicle['direction'] == 'south':
-                    vehicle['position']['y'] += 2 * dt * 60
-                elif vehicle['direction'] == 'east':
-                    vehicle['position']['x'] += 2 * dt * 60
-                elif vehicle['direction'] == 'west':
-                    vehicle['position']['x'] -= 2 * dt * 60
-                
-                # Check if crossed
-                if (vehicle['position']['y'] < -50 or vehicle['position']['y'] > 950 or
-                    vehicle['position']['x'] < -50 or vehicle['position']['x'] > 1450):
-                    vehicle['crossed'] = True
+        self._emergency_dir = _step_vehicles(
+            self.pos_x, self.pos_y, self.dir_idx, self.type_idx, self.crossed, self.waiting, self.wait_time,
+            self._queue_count, self._wait_sum, self._can_go_ns, self._can_go_ew, dt, self.n_vehicles
+        )
+        
+        # Every active row is counted in some queue, so a shortfall means rows crossed this tick
+        if self._queue_count.sum() < self.n_vehicles:
+            self._compact_vehicles()
         
         # Log metrics
         self.log_metrics()
+        self.publish()
     
     def log_metrics(self):
         """Log current metrics"""
-        active_vehicles = [v for v in self.vehicles if not v['crossed']]
-        
-        queues = {'north': 0, 'south': 0, 'east': 0, 'west': 0}
-        for v in active_vehicles:
-            queues[v['direction']] += 1
+        queues = self._queue_count.tolist()
+        active_count = sum(queues)
         
-        total_wait = sum(v['wait_time'] for v in active_vehicles)
-        avg_wait = total_wait / len(active_vehicles) if active_vehicles else 0
+        total_wait = float(self._wait_sum.sum())
+        avg_wait = total_wait / active_count if active_count else 0
         
         metrics = {
             'timestamp': self.sim_time,
-            'active_vehicles': len(active_vehicles),
+            'active_vehicles': active_count,
             'total_processed': self.vehicle_count,
-            'crossed': self.vehicle_count - len(active_vehicles),
-            'queue_north': queues['north'],
-            'queue_south': queues['south'],
-            'queue_east': queues['east'],
-            'queue_west': queues['west'],
+            'crossed': self.vehicle_count - active_count,
+            'queue_north': queues[0],
+            'queue_south': queues[1],
+            'queue_east': queues[2],
+            'queue_west': queues[3],
             'avg_wait_time': avg_wait,
             'light_ns': self.light_state['north_south'],
             'light_ew': self.light_state['east_west'],
             'emergency_active': self.light_state['emergency_mode']
         }
         
-        self.metrics_history.append(metrics)
-        self.data_log.append(metrics)
-    
-    def get_state(self):
-        """Get current simulation state"""
-        return SimulationState(
-            sim_time=self.sim_time,
-            vehicles=[VehicleModel(**v) for v in self.vehicles if not v['crossed']],
-            traffic_light=TrafficLightModel(
-                north_south=self.light_state['north_south'],
-                east_west=self.light_state['east_west'],
-                time_remaining=self.light_state['phase_duration'] - self.light_state['timer'],
-                emergency_mode=self.light_state['emergency_mode']
-            ),
-            agent_decision=self.agent_decision,
-            metrics=list(self.metrics_history)[-1] if self.metrics_history else {}
+        self.latest_metrics = metrics
+        
+        agg = self._agg
+        agg['rows'] += 1
+        agg['wait_sum'] += avg_wait
+        agg['wait_max'] = max(agg['wait_max'], avg_wait)
+        agg['queue_sums'] = [total + q for total, q in zip(agg['queue_sums'], queues)]
+        agg['queue_max'] = max(agg['queue_max'], *queues)
+        agg['crossed_max'] = max(agg['crossed_max'], metrics['crossed'])
+        agg['emergency_rows'] += metrics['emergency_active']
+        
+        if self.metrics_n == len(self.metrics_log):
+            self._make_metrics_room()
+        self.metrics_log[self.metrics_n] = (
+            self.sim_time, active_count, self.vehicle_count, self.vehicle_count - active_count,
+            *queues, avg_wait,
+            *PHASE_LIGHT_CODES[self._phase],
+            self.light_state['emergency_mode']
         )
+        self.metrics_n += 1
+    
+    def _make_metrics_room(self):
+        """Double the metrics log, or once at capacity shift out the oldest half"""
+        if len(self.metrics_log) < METRICS_CAPACITY:
+            capacity = min(2 * len(self.metrics_log), METRICS_CAPACITY)
+            grown = np.empty((capacity, len(METRIC_FIELDS)), dtype=np.float64)
+            grown[:self.metrics_n] = self.metrics_log[:self.metrics_n]
+            self.metrics_log = grown
+        else:
+            keep = METRICS_CAPACITY // 2
+            self.metrics_log[:keep] = self.metrics_log[self.metrics_n - keep:self.metrics_n]
+            self.metrics_n = keep
+    
+    def metrics_column(self, name, start=0):
+        """View of one metrics column from row `start` onwards"""
+        return self.metrics_log[start:self.metrics_n, METRIC_INDEX[name]]
+    
+    def metrics_block(self, fields=METRIC_FIELDS, start=0):
+        """Copy of the given metrics columns from row `start` onwards, safe to decode after releasing the lock"""
+        return self.metrics_log[start:self.metrics_n, [METRIC_INDEX[name] for name in fields]]
+    
+    def publish(self):
+        """Swap in a fresh (etag, state) snapshot; readers take the tuple without locking"""
+        # run_id separates runs across resets; sim_time covers every tick; vehicle_count covers spawns while paused
+        etag = f'"{self.run_id}-{self.sim_time:.3f}-{self.vehicle_count}"'
+        self.snapshot = (etag, self.get_state_dict())
+    
+    def get_state_dict(self):
+        """Current simulation state as plain JSON-ready data, skipping model validation (push channels)"""
+        return {
+            'sim_time': float(self.sim_time),
+            'vehicles': self.vehicle_dicts(slice(0, self.n_vehicles)),
+            'traffic_light': {
+                'north_south': self.light_state['north_south'],
+                'east_west': self.light_state['east_west'],
+                'time_remaining': float(self.light_state['phase_duration'] - self.light_state['timer']),
+                'emergency_mode': self.light_state['emergency_mode']
+            },
+            'agent_decision': self.agent_decision,
+            'metrics': self.latest_metrics
+        }
 
 # ==================== GLOBAL SIMULATION INSTANCE ====================
 
@@ -388,7 +622,7 @@ async def root():
     }
 
 @app.post("/simulation/start")
-async def start_simulation(background_tasks: BackgroundTasks):
+async def start_simulation():
     """Start the simulation"""
     global simulation_task
     
@@ -396,7 +630,10 @@ async def start_simulation(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=400, detail="Simulation already running")
     
     simulation.running = True
-    background_tasks.add_task(run_simulation_loop)
+    # A thread that was just stopped may still be finishing its last sleep; it picks the flag back up
+    if simulation_task is None or not simulation_task.is_alive():
+        simulation_task = threading.Thread(target=run_simulation_loop, name="simulation", daemon=True)
+        simulation_task.start()
     
     return {
         "status": "started",
@@ -432,10 +669,15 @@ async def reset_simulation():
     simulation = SimulationEngine()
     return {"status": "reset"}
 
-@app.get("/simulation/state")
-async def get_state():
-    """Get current simulation state"""
-    return simulation.get_state()
+@app.get("/simulation/state", response_model=SimulationState)
+async def get_state(request: Request):
+    """Get current simulation state (answers 304 when the client's ETag is current)"""
+    etag, state = simulation.snapshot
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # The snapshot is built by the engine in the SimulationState shape; serialize it without re-validating
+    return ORJSONResponse(state, headers={"ETag": etag})
 
 @app.get("/simulation/config")
 async def get_config():
@@ -445,33 +687,22 @@ async def get_config():
 @app.put("/simulation/config")
 async def update_config(config: SimulationConfig):
     """Update simulation configuration"""
-    simulation.config = config
+    with simulation.lock:
+        simulation.apply_config(config)
     return {"status": "updated", "config": config}
 
 @app.post("/simulation/spawn_emergency")
 async def spawn_emergency():
     """Spawn an emergency vehicle"""
-    simulation.vehicle_count += 1
-    direction = random.choice(['north', 'south', 'east', 'west'])
-    
-    vehicle = {
-        'id': simulation.vehicle_count,
-        'type': 'emergency',
-        'direction': direction,
-        'position': simulation._get_spawn_position(direction),
-        'waiting': False,
-        'wait_time': 0,
-        'crossed': False,
-        'priority': 10,
-        'spawn_time': simulation.sim_time
-    }
-    
-    simulation.vehicles.append(vehicle)
+    dir_idx = random.randrange(4)
+    with simulation.lock:
+        vehicle_id = simulation.add_vehicle(EMERGENCY, dir_idx)
+        simulation.publish()
     
     return {
         "status": "spawned",
-        "vehicle_id": vehicle['id'],
-        "direction": direction
+        "vehicle_id": vehicle_id,
+        "direction": DIRECTIONS[dir_idx]
     }
 
 # ==================== ANALYTICS ENDPOINTS ====================
@@ -479,101 +710,185 @@ async def spawn_emergency():
 @app.get("/analytics/summary")
 async def get_analytics_summary():
     """Get analytics summary"""
-    if not simulation.data_log:
+    with simulation.lock:
+        agg = dict(simulation._agg)
+        latest = simulation.latest_metrics
+    
+    rows = agg['rows']
+    if rows == 0:
         return {"error": "No data available"}
     
-    df = pd.DataFrame(simulation.data_log)
+    # Timestamps and processed counts only grow, so the latest row holds their maxima
+    total_time = float(latest['timestamp'])
     
     summary = {
-        "total_vehicles_processed": int(df['total_processed'].max()),
-        "total_simulation_time": float(df['timestamp'].max()),
-        "average_wait_time": float(df['avg_wait_time'].mean()),
-        "max_wait_time": float(df['avg_wait_time'].max()),
-        "average_queue_length": {
-            "north": float(df['queue_north'].mean()),
-            "south": float(df['queue_south'].mean()),
-            "east": float(df['queue_east'].mean()),
-            "west": float(df['queue_west'].mean())
-        },
-        "peak_queue_length": int(df[['queue_north', 'queue_south', 'queue_east', 'queue_west']].max().max()),
-        "emergency_activations": int(df['emergency_active'].sum()),
-        "throughput": float(df['crossed'].max() / (df['timestamp'].max() / 60)) if df['timestamp'].max() > 0 else 0
+        "run_id": simulation.run_id,
+        "total_vehicles_processed": latest['total_processed'],
+        "total_simulation_time": total_time,
+        "average_wait_time": agg['wait_sum'] / rows,
+        "max_wait_time": float(agg['wait_max']),
+        "average_queue_length": {d: total / rows for d, total in zip(DIRECTIONS, agg['queue_sums'])},
+        "peak_queue_length": agg['queue_max'],
+        "emergency_activations": agg['emergency_rows'],
+        "throughput": agg['crossed_max'] / (total_time / 60) if total_time > 0 else 0
     }
     
     return summary
 
 @app.get("/analytics/timeseries")
-async def get_timeseries(metric: str = "all"):
-    """Get time series data"""
-    if not simulation.data_log:
-        return {"error": "No data available"}
-    
-    df = pd.DataFrame(simulation.data_log)
-    
+async def get_timeseries(metric: str = "all", since: Optional[float] = None):
+    """Get time series data, optionally only rows recorded after `since`"""
     if metric == "all":
-        return df.to_dict('records')
-    elif metric in df.columns:
-        return df[['timestamp', metric]].to_dict('records')
+        fields = METRIC_FIELDS
+    elif metric in METRIC_INDEX:
+        fields = ('timestamp', metric)
     else:
-        raise HTTPException(status_code=400, detail=f"Invalid metric: {metric}")
+        fields = None
+    
+    # Only copy the rows under the lock; decoding them there would stall the simulation thread
+    with simulation.lock:
+        if simulation.metrics_n == 0:
+            return {"error": "No data available"}
+        if fields is None:
+            raise HTTPException(status_code=400, detail=f"Invalid metric: {metric}")
+        
+        # Timestamps only grow, so the rows after `since` are a suffix
+        start = 0
+        if since is not None:
+            start = int(np.searchsorted(simulation.metrics_column('timestamp'), since, side='right'))
+        
+        block = simulation.metrics_block(fields, start)
+    
+    # Decode on a worker thread so a full-history request doesn't block the event loop either
+    return await asyncio.to_thread(metrics_records, fields, block)
 
 @app.get("/analytics/agent_decisions")
 async def get_agent_decisions():
     """Get agent decision history"""
+    with simulation.lock:
+        decisions = simulation.decision_history()
+    
     return {
-        "total_decisions": len(simulation.decision_history),
-        "decisions": list(simulation.decision_history)
+        "total_decisions": len(decisions),
+        "decisions": decisions
     }
 
 @app.get("/analytics/vehicle_stats")
 async def get_vehicle_stats():
     """Get vehicle statistics"""
-    if not simulation.vehicles:
-        return {"error": "No vehicles"}
-    
-    types = {'car': 0, 'bus': 0, 'truck': 0, 'emergency': 0}
-    directions = {'north': 0, 'south': 0, 'east': 0, 'west': 0}
-    
-    for v in simulation.vehicles:
-        types[v['type']] += 1
-        directions[v['direction']] += 1
+    with simulation.lock:
+        total = simulation.vehicle_count
+        if total == 0:
+            return {"error": "No vehicles"}
+        
+        types = simulation._count_by_type.tolist()
+        directions = simulation._count_by_dir.tolist()
+        active = int(simulation._queue_count.sum())
     
     return {
-        "by_type": types,
-        "by_direction": directions,
-        "total": len(simulation.vehicles),
-        "active": len([v for v in simulation.vehicles if not v['crossed']]),
-        "crossed": len([v for v in simulation.vehicles if v['crossed']])
+        "by_type": dict(zip(VEHICLE_TYPES, types)),
+        "by_direction": dict(zip(DIRECTIONS, directions)),
+        "total": total,
+        "active": active,
+        "crossed": total - active
     }
 
 # ==================== WEBSOCKET FOR REAL-TIME UPDATES ====================
 
 @app.websocket("/ws/simulation")
-async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket for real-time simulation updates"""
+async def websocket_endpoint(websocket: WebSocket, deltas: bool = False):
+    """WebSocket for real-time simulation updates (latest state only; `?deltas=true` for changed vehicles only)"""
     await websocket.accept()
     
+    last_tag = None
+    last_run = None
+    last_sent = {}  # Vehicle id -> (x, y, waiting) as last sent, positions quantized to 1px
+    
     try:
         while True:
-            if simulation.running:
-                state = simulation.get_state()
-                await websocket.send_json(state.dict())
+            # Each send is awaited before the next snapshot is read, so frames produced meanwhile are skipped
+            engine = simulation
+            tag, state = engine.snapshot
+            if engine.running and tag != last_tag:
+                last_tag = tag
+                if deltas:
+                    if engine.run_id != last_run:
+                        # New connection or reset: ids restart, so send a full frame and diff against it
+                        last_run = engine.run_id
+                        last_sent.clear()
+                        vehicle_delta(state, last_sent)
+                    else:
+                        state = vehicle_delta(state, last_sent)
+                await websocket.send_text(orjson.dumps(state).decode())
             
             await asyncio.sleep(0.1)  # 10 updates per second
     except Exception as e:
         print(f"WebSocket error: {e}")
 
+def vehicle_delta(state, last_sent):
+    """Replace the vehicle list with new vehicles, moved vehicles and removed ids relative to `last_sent`"""
+    added, moved = [], []
+    current = {}
+    
+    for v in state['vehicles']:
+        key = (round(v['position']['x']), round(v['position']['y']), v['waiting'])
+        current[v['id']] = key
+        previous = last_sent.get(v['id'])
+        if previous is None:
+            added.append(v)
+        elif previous != key:
+            moved.append({'id': v['id'], 'x': v['position']['x'], 'y': v['position']['y'], 'waiting': v['waiting']})
+    
+    removed = [vid for vid in last_sent if vid not in current]
+    last_sent.clear()
+    last_sent.update(current)
+    
+    delta = {k: v for k, v in state.items() if k != 'vehicles'}
+    delta.update(added=added, moved=moved, removed=removed)
+    return delta
+
+@app.get("/simulation/stream")
+async def stream_state():
+    """Server-sent events: one state event per simulation change, comment keep-alives while idle"""
+    async def events():
+        last_tag = None
+        idle = 0
+        
+        while True:
+            tag, state = simulation.snapshot
+            if tag != last_tag:
+                last_tag = tag
+                idle = 0
+                yield b"data: " + orjson.dumps(state) + b"\n\n"
+            else:
+                idle += 1
+                if idle % 10 == 0:
+                    yield b": keep-alive\n\n"  # Lets clients detect a dead stream while paused
+            
+            await asyncio.sleep(0.1)  # Matches the simulation timestep
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 # ==================== BACKGROUND TASK ====================
 
-async def run_simulation_loop():
-    """Background task to run simulation"""
+def run_simulation_loop():
+    """Simulation thread: fixed 100ms steps paced against the monotonic clock, off the event loop"""
     dt = 0.1  # 100ms timestep
+    next_t = time.monotonic()
     
+    # Re-read the global each step: reset swaps in a fresh (stopped) engine, which ends the loop
     while simulation.running:
-        if not simulation.paused:
-            simulation.update(dt)
-        
-        await asyncio.sleep(dt)
+        engine = simulation
+        if not engine.paused:
+            with engine.lock:
+                engine.update(dt)
+        
+        next_t += dt
+        delay = next_t - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_t = time.monotonic()  # Fell behind; resync rather than burst to catch up
 
 # ==================== STARTUP EVENT ====================
 